@@ -1,10 +1,29 @@
 #!/usr/bin/env python3
 # AI Penny Scanner — hardened: retries, throttles, safe batch dl, best-effort everything
 
-import os, sys, time, math, requests, traceback
+import os, re, sys, csv, time, math, functools, tempfile, requests, traceback
+import numpy as np
 import pandas as pd
-import yfinance as yf
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import polars as pl
+except ImportError:  # optional: faster CSV writer, pandas covers it otherwise
+    pl = None
+
+try:
+    from numba import njit, prange, vectorize
+except ImportError:  # numba is a speedup, not a requirement: fall back to plain Python
+    prange = range
+    def vectorize(*args, **kwargs):
+        return np.vectorize
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda f: f
 
 # -------- Env / defaults --------
 TOP_N = int(os.getenv("TOP_N", "8"))
@@ -16,105 +35,267 @@ PCT_CHANGE_MIN = float(os.getenv("PCT_CHANGE_MIN", "8.0"))
 NEWS_LOOKBACK_DAYS = int(os.getenv("NEWS_LOOKBACK_DAYS", "0"))  # keep 0 for now
 DISCORD_WEBHOOK_URL = os.getenv("DISCORD_WEBHOOK_URL", "")
 
+UNIVERSE_URL = "https://raw.githubusercontent.com/datasets/nasdaq-listings/master/data/nasdaq-listed-symbols.csv"
+UNIVERSE_CACHE = os.path.join(tempfile.gettempdir(), "nasdaq-listed-symbols.csv")
+UNIVERSE_TTL_S = 24 * 3600  # listings change at most daily
+SYMBOL_RE = re.compile(r"[A-Za-z]{1,5}")  # plain common-stock tickers only
+NEWS_WORKERS = 16   # news lookups are pure network wait; threads overlap them
+FETCH_WORKERS = 4   # per-symbol chart downloads; kept low so Yahoo doesn't rate-limit us
+
+# -------- HTTP --------
+# One pooled session for every call so keep-alive sockets / TLS are reused per host
+HTTP_HEADERS = {"User-Agent": "Mozilla/5.0 (penny-scanner)"}
+SESSION = requests.Session()
+SESSION.headers.update(HTTP_HEADERS)
+_adapter = HTTPAdapter(pool_connections=8, pool_maxsize=max(32, NEWS_WORKERS, FETCH_WORKERS),
+                       max_retries=Retry(total=3, backoff_factor=0.5,
+                                         status_forcelist=(429, 500, 502, 503, 504),
+                                         respect_retry_after_header=True))
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+
 # -------- Helpers --------
 def log(msg):
     print(msg, flush=True)
 
-def safe_get(url, retries=3, sleep_s=2):
+def safe_get(url, retries=3, sleep_s=2, headers=None):
     for i in range(retries):
         try:
-            return requests.get(url, timeout=20)
+            return SESSION.get(url, headers=headers, timeout=20)
         except Exception as e:
             log(f"[WARN] GET failed (attempt {i+1}/{retries}): {e}")
             time.sleep(sleep_s)
     return None
 
-def load_universe(max_symbols=600):
-    # Use reliable GitHub list
-    url = "https://raw.githubusercontent.com/datasets/nasdaq-listings/master/data/nasdaq-listed-symbols.csv"
-    r = safe_get(url)
-    if r and r.status_code == 200:
+FALLBACK_TICKERS = ("RR","SNDL","BBIG","GME","AMC","NNDM","GNS","NAKD","CEI","MARA","RIOT")
+
+def parse_symbols(lines):
+    """Clean ticker set from CSV text lines; rows are filtered as they are parsed."""
+    syms = set()
+    for row in csv.DictReader(lines):
+        t = row.get("Symbol")
+        if t and SYMBOL_RE.fullmatch(t):
+            syms.add(t)
+    return syms
+
+def parse_symbols_file(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return parse_symbols(f)
+
+def remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+def fetch_universe_symbols(url=UNIVERSE_URL, path=UNIVERSE_CACHE, ttl_s=UNIVERSE_TTL_S):
+    """Universe symbols from a local copy of the CSV, refetched only when older than ttl_s.
+
+    Revalidates with the ETag kept in a sidecar file so an unchanged list costs a 304.
+    A fresh download is parsed from the response, then written to the cache.
+    Returns a set of symbols, or None if nothing is available.
+    """
+    have = os.path.exists(path)
+    if have and time.time() - os.path.getmtime(path) < ttl_s:
+        return parse_symbols_file(path)
+
+    etag_path = path + ".etag"
+    headers = {}
+    if have and os.path.exists(etag_path):
         try:
-            dfu = pd.read_csv(pd.compat.StringIO(r.text))
-        except Exception:
-            # pandas 2.x: no compat.StringIO. Fallback:
-            from io import StringIO
-            dfu = pd.read_csv(StringIO(r.text))
-        tickers = sorted(dfu['Symbol'].dropna().unique().tolist())
-    else:
-        tickers = []
+            with open(etag_path) as f:
+                etag = f.read().strip()
+            if etag:
+                headers["If-None-Match"] = etag
+        except OSError:
+            pass
+
+    r = safe_get(url, headers=headers)
+    if r is not None and r.status_code == 304 and have:
+        try:
+            os.utime(path)  # unchanged upstream; restart the TTL
+        except OSError:
+            pass  # copy is still current; we just revalidate again next run
+        return parse_symbols_file(path)
+    if r is not None and r.status_code == 200:
+        # Parse the body once, then cache it; a failed write never costs the parsed list
+        r.encoding = r.encoding or "utf-8"
+        text = r.text
+        syms = parse_symbols(text.splitlines())
+        tmp = path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8", newline="") as f:
+                f.write(text)
+            os.replace(tmp, path)  # atomic: readers never see a partial file
+            etag = r.headers.get("ETag")
+            if etag:
+                with open(etag_path, "w") as f:
+                    f.write(etag)
+        except OSError as e:
+            log(f"[WARN] universe cache write failed: {e}")
+            remove_quietly(tmp)
+        return syms
+
+    # Stale copy beats the tiny fallback sample
+    return parse_symbols_file(path) if have else None
 
-    if not tickers:
-        # Fallback sample
-        tickers = ["RR","SNDL","BBIG","GME","AMC","NNDM","GNS","NAKD","CEI","MARA","RIOT"]
+@functools.lru_cache(maxsize=1)
+def universe_symbols():
+    """Sorted tuple of listed symbols, memoized for the run.
 
-    # Clean & cap
-    tickers = [t for t in tickers if isinstance(t, str) and t.isalpha() and 1 <= len(t) <= 5]
+    Raises when nothing could be loaded, so a failed fetch is never memoized and a
+    later call retries.
+    """
+    syms = fetch_universe_symbols()
+    if syms is None:
+        raise RuntimeError("universe CSV unavailable")
+    if not syms:
+        raise RuntimeError("universe CSV has no usable symbols")
+    return tuple(sorted(syms))
+
+def load_universe(max_symbols=600):
+    # Use reliable GitHub list (cached on disk for a day, and in memory for the run)
+    try:
+        tickers = universe_symbols()
+    except Exception as e:
+        log(f"[WARN] universe load failed, using fallback sample: {e}")
+        tickers = FALLBACK_TICKERS
     return tickers[:max_symbols]
 
 def chunk(lst, n):
     for i in range(0, len(lst), n):
         yield lst[i:i+n]
 
-def dl_batch(batch, lookback_days=30, retries=3):
-    """Download OHLCV for a batch safely, no threads, with retries."""
-    for i in range(retries):
+CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart/{}"
+
+def quote_arrays(result):
+    """(close, volume) float32 arrays from one chart result block, or None."""
+    quote = result["indicators"]["quote"][0]
+    close, volume = quote.get("close"), quote.get("volume")
+    if close is None or volume is None:
+        return None
+    # JSON nulls (halted / missing bars) become NaN. float32 is plenty for the coarse
+    # price/volume filters and halves the bytes the filter kernel streams through.
+    return np.asarray(close, dtype=np.float32), np.asarray(volume, dtype=np.float32)
+
+def fetch_chart(symbol, range_="1mo", interval="1d"):
+    """Single-symbol chart call -> (close, volume) float arrays, or None."""
+    r = SESSION.get(
+        CHART_URL.format(symbol),
+        params={"range": range_, "interval": interval, "events": "div,split"},
+        timeout=20,
+    )
+    if r.status_code == 404:  # unknown / delisted symbol; retrying won't help
+        return None
+    r.raise_for_status()
+    try:
+        return quote_arrays(r.json()["chart"]["result"][0])
+    except (KeyError, IndexError, TypeError):
+        return None
+
+def fetch_bars(symbols, range_="1mo", interval="1d", retries=3):
+    """Daily close/volume straight from Yahoo's chart endpoint -> {ticker: (close, volume)}.
+
+    One request per symbol (the multi-symbol spark endpoint carries close only, no
+    volume), issued concurrently on a thread pool over the shared session.
+    """
+    def one(t):
+        for i in range(retries):
+            try:
+                return t, fetch_chart(t, range_=range_, interval=interval)
+            except Exception as e:
+                log(f"[WARN] chart dl failed (attempt {i+1}/{retries}) for {t}: {e}")
+                time.sleep(2 + i*2)
+        return t, None
+
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as ex:
+        return {t: cv for t, cv in ex.map(one, symbols) if cv is not None}
+
+QUOTE_URL = "https://query1.finance.yahoo.com/v7/finance/quote"
+QUOTE_GROUP = 20
+COOKIE_URL = "https://fc.yahoo.com"
+CRUMB_URL = "https://query1.finance.yahoo.com/v1/test/getcrumb"
+
+def yahoo_crumb():
+    """Cookie/crumb handshake the quote endpoint requires; the cookie stays on SESSION.
+
+    Returns the crumb string, or None if Yahoo didn't hand one out.
+    """
+    try:
+        SESSION.get(COOKIE_URL, timeout=20)  # sets the A3 cookie; the body (often a 404) is irrelevant
+        r = SESSION.get(CRUMB_URL, timeout=20)
+        r.raise_for_status()
+        crumb = r.text.strip()
+        return crumb if crumb and "<" not in crumb else None
+    except Exception as e:
+        log(f"[WARN] Yahoo crumb fetch failed: {e}")
+        return None
+
+def prefilter_by_price(tickers):
+    """Keep tickers whose snapshot price is in [MIN_PRICE, MAX_PRICE) before the bar download.
+
+    Best-effort: without a crumb, or if a quote call fails, the remaining tickers pass
+    through unfiltered and the kernel's own price check does the work.
+    """
+    tickers = list(tickers)
+    crumb = yahoo_crumb()
+    if crumb is None:
+        log(f"[WARN] no Yahoo crumb; skipping price prefilter for {len(tickers)} tickers")
+        return tickers
+
+    keep = []
+    for i in range(0, len(tickers), QUOTE_GROUP):
+        group = tickers[i:i+QUOTE_GROUP]
         try:
-            data = yf.download(
-                batch,
-                period=f"{lookback_days}d",
-                interval="1d",
-                auto_adjust=False,
-                progress=False,
-                threads=False,  # <- reliability > speed
-                group_by="ticker",
+            r = SESSION.get(
+                QUOTE_URL,
+                params={"symbols": ",".join(group), "fields": "regularMarketPrice", "crumb": crumb},
+                timeout=20,
             )
-            if data is None or data.empty:
-                raise ValueError("empty batch download")
-            return data
+            r.raise_for_status()
+            quotes = ((r.json() or {}).get("quoteResponse") or {}).get("result") or []
         except Exception as e:
-            log(f"[WARN] batch dl failed (attempt {i+1}/{retries}) for {len(batch)} tickers: {e}")
-            time.sleep(2 + i*2)
-    return None
+            log(f"[WARN] quote prefilter unavailable, keeping {len(tickers) - i} tickers: {e}")
+            return keep + tickers[i:]
+        px = {q.get("symbol"): q.get("regularMarketPrice") for q in quotes}
+        keep.extend(t for t in group
+                    if px.get(t) is not None and MIN_PRICE <= px[t] < MAX_PRICE)
+    return keep
 
-def extract_series(data, tkr):
-    """Return close, vol series for ticker across both MultiIndex and dict-like formats safely."""
-    try:
-        # When group_by="ticker", data behaves like a dict of DataFrames per ticker
-        if isinstance(data, dict) or (hasattr(data, "keys") and tkr in data):
-            df = data[tkr]
-            return df["Close"].dropna(), df["Volume"].dropna()
-        # Older MultiIndex style
-        if isinstance(data.columns, pd.MultiIndex):
-            return data["Close"][tkr].dropna(), data["Volume"][tkr].dropna()
-        # Single ticker fallback
-        if "Close" in data and "Volume" in data:
-            return data["Close"].dropna(), data["Volume"].dropna()
-    except Exception:
-        pass
-    return pd.Series(dtype=float), pd.Series(dtype=float)
+def right_aligned(arrays, n_days):
+    """(n_days x tickers) matrix of per-ticker arrays, NaNs dropped, latest bar in the last row."""
+    out = np.full((n_days, len(arrays)), np.nan, dtype=np.float32)
+    for j, a in enumerate(arrays):
+        a = a[~np.isnan(a)][-n_days:]
+        if len(a):
+            out[n_days - len(a):, j] = a
+    return out
 
-def news_flag(ticker: str) -> str:
+SEARCH_URL = "https://query1.finance.yahoo.com/v1/finance/search"
+
+def news_cutoff(lookback_days=NEWS_LOOKBACK_DAYS):
+    """Start of the news window as epoch seconds; computed once per run, shared by all lookups."""
+    return time.time() - lookback_days * 86400
+
+def news_flag(ticker: str, cutoff_ts=None) -> str:
     """Best-effort news flag; never crash."""
-    try:
-        lookback = NEWS_LOOKBACK_DAYS
-    except Exception:
-        lookback = 0
-    if lookback <= 0:
+    if NEWS_LOOKBACK_DAYS <= 0:
         return "No"
+    if cutoff_ts is None:
+        cutoff_ts = news_cutoff()
     try:
-        nlist = yf.Ticker(ticker).news or []
-        cutoff = datetime.utcnow() - timedelta(days=lookback)
+        r = SESSION.get(SEARCH_URL, params={"q": ticker, "quotesCount": 0, "newsCount": 10}, timeout=20)
+        r.raise_for_status()
+        nlist = (r.json() or {}).get("news") or []
         for n in nlist:
             ts = n.get("providerPublishTime") or n.get("publishedAt") or n.get("time_published")
             if not ts:
                 continue
             try:
-                ts_dt = datetime.utcfromtimestamp(int(ts))
-            except Exception:
+                if int(ts) >= cutoff_ts:
+                    return "Yes"
+            except (TypeError, ValueError):
                 continue
-            if ts_dt >= cutoff:
-                return "Yes"
         return "No"
     except Exception:
         return "Unknown"
@@ -122,79 +303,160 @@ def news_flag(ticker: str) -> str:
 def format_discord(df, top_n=10):
     if df is None or df.empty:
         return "**Penny Scan Alert**\nNo candidates today."
-    df = df.head(top_n).copy()
-    lines = ["**Penny Scan Alert**"]
-    for _, r in df.iterrows():
-        lines.append(
-            (f"\n**{r['Ticker']}**  ${r['LastPrice']} | "
-             f"Entry {r['Entry']} | Stop {r['Stop']} | T1 {r['Target1']} | T2 {r['Target2']} | "
-             f"Vol× {r['VolRatio']} | Chg {r['PctChange']}% | News48h {r.get('RecentNews48h','No')}")
-        )
-    return "\n".join(lines)
+    df = df.head(top_n)
+    col = lambda c: df[c].astype(str)
+    news = col("RecentNews48h") if "RecentNews48h" in df else "No"
+    # Whole-column string concat; one line per candidate, blank line between them
+    parts = ("\n**" + col("Ticker") + "**  $" + col("LastPrice") + " | "
+             + "Entry " + col("Entry") + " | Stop " + col("Stop")
+             + " | T1 " + col("Target1") + " | T2 " + col("Target2") + " | "
+             + "Vol× " + col("VolRatio") + " | Chg " + col("PctChange") + "% | News48h " + news)
+    return "**Penny Scan Alert**\n" + "\n".join(parts.tolist())
+
+def write_csv(df, path):
+    """Write df to CSV with polars' writer when available, pandas otherwise."""
+    if pl is not None:
+        try:
+            pl.DataFrame({c: df[c].tolist() if df[c].dtype == object else df[c].to_numpy()
+                          for c in df.columns}).write_csv(path)
+            return
+        except Exception as e:
+            log(f"[WARN] polars CSV write failed, using pandas: {e}")
+    df.to_csv(path, index=False)
+
+def post_discord(msg, timeout_s=10):
+    try:
+        r = SESSION.post(DISCORD_WEBHOOK_URL, json={"content": msg[:1900]}, timeout=timeout_s)
+        log(f"[INFO] discord status: {r.status_code}")
+    except Exception as e:
+        log(f"[WARN] discord post error: {e}")
+
+# -------- Filter kernel --------
+# No fastmath: the NaN padding from right_aligned must survive the isnan checks.
+@njit(parallel=True, cache=True)
+def filter_kernel(close, vol, min_p, max_p, min_av, ratio_thr, pct_thr):
+    """Candidate filter over right-aligned (days x tickers) close/volume; one ticker per column.
+
+    Inputs are float32; sums accumulate in float64 and the per-ticker outputs are float64.
+    """
+    n_days, n_t = close.shape
+    out_mask = np.zeros(n_t, np.bool_)
+    last_o = np.full(n_t, np.nan)
+    pct_o = np.full(n_t, np.nan)
+    av_o = np.full(n_t, np.nan)
+    tv_o = np.full(n_t, np.nan)
+    vr_o = np.full(n_t, np.nan)
+    hi_o = np.full(n_t, np.nan)
+    for j in prange(n_t):
+        nc = 0
+        nv = 0
+        for i in range(n_days):
+            if not np.isnan(close[i, j]):
+                nc += 1
+            if not np.isnan(vol[i, j]):
+                nv += 1
+        if nc < 5 or nv < 5:
+            continue
+
+        last = close[n_days - 1, j]
+        prev = close[n_days - 2, j]
+        w = min(20, nv)
+        s = 0.0
+        for i in range(n_days - w, n_days):
+            s += vol[i, j]
+        avg20 = s / w
+        hi20 = -np.inf
+        for i in range(n_days - min(20, nc), n_days):
+            hi20 = max(hi20, close[i, j])
+        tv = vol[n_days - 1, j]
+        pct = (last / prev - 1.0) * 100.0
+        ratio = tv / avg20 if avg20 > 0 else np.nan
+
+        last_o[j] = last
+        pct_o[j] = pct
+        av_o[j] = avg20
+        tv_o[j] = tv
+        vr_o[j] = ratio
+        hi_o[j] = hi20
+        out_mask[j] = (min_p <= last and last < max_p and avg20 >= min_av
+                       and ratio >= ratio_thr and pct >= pct_thr)
+    return out_mask, last_o, pct_o, av_o, tv_o, vr_o, hi_o
+
+# -------- Trade plan ufuncs --------
+# No fastmath: it lets the 4-place rounding drift (1.9400000000000002 instead of 1.94).
+# Thresholds come in as arguments, never globals: numba freezes globals at compile
+# time and cache=True would carry a stale MIN_PRICE across runs.
+@vectorize(["float64(float64, float64)"], nopython=True, cache=True)
+def plan_entry(px, min_p):
+    return round(max(min_p, px * 0.97), 4)      # ~3% pullback
+
+@vectorize(["float64(float64)"], nopython=True, cache=True)
+def plan_stop(entry):
+    return round(entry * 0.90, 4)               # ~10% risk
+
+@vectorize(["float64(float64)"], nopython=True, cache=True)
+def plan_target1(entry):
+    return round(entry * 1.12, 4)               # +12%
+
+@vectorize(["float64(float64)"], nopython=True, cache=True)
+def plan_target2(entry):
+    return round(entry * 1.25, 4)               # +25%
 
 # -------- Main scan --------
+SCAN_COLUMNS = ["Ticker","LastPrice","PctChange","AvgVol20d","TodayVol","VolRatio","High20d","Breakout"]
+
 def scan_universe(tickers):
-    results = []
-    lookback_days = 30
+    cols = {k: [] for k in SCAN_COLUMNS}  # columnar accumulator, one list per output field
+    range_ = "1mo"  # ~21 daily bars
     BATCH = 100  # small batches for reliability
 
+    # Pacing is done per request: FETCH_WORKERS caps concurrency and the session's Retry
+    # backs off on 429/5xx (honouring Retry-After)
     for batch in chunk(tickers, BATCH):
-        time.sleep(0.3)  # batch throttle
-        data = dl_batch(batch, lookback_days=lookback_days, retries=3)
-        if data is None:
+        data = fetch_bars(batch, range_=range_, retries=3)
+        if not data:
             log(f"[WARN] skipping batch of {len(batch)} (still None after retries)")
             continue
 
-        for t in batch:
-            try:
-                time.sleep(0.03)  # per-ticker throttle
-                c, v = extract_series(data, t)
-                if c.empty or v.empty or len(c) < 5 or len(v) < 5:
-                    continue
-
-                last_px = float(c.iloc[-1])
-                if not (MIN_PRICE <= last_px < MAX_PRICE):
-                    continue
-
-                avg20 = float(v.tail(20).mean()) if len(v) >= 20 else float(v.mean())
-                if avg20 < MIN_AVG_VOL:
-                    continue
-
-                today_vol = float(v.iloc[-1])
-                vol_ratio = today_vol / avg20 if avg20 > 0 else 0.0
-                if vol_ratio < VOL_RATIO_THRESHOLD:
-                    continue
-
-                pct_change = (c.iloc[-1] / c.iloc[-2] - 1.0) * 100.0 if len(c) >= 2 else 0.0
-                if pct_change < PCT_CHANGE_MIN:
-                    continue
-
-                hi20 = float(c.tail(20).max())
-                results.append({
-                    "Ticker": t,
-                    "LastPrice": round(last_px, 4),
-                    "PctChange": round(pct_change, 2),
-                    "AvgVol20d": int(avg20),
-                    "TodayVol": int(today_vol),
-                    "VolRatio": round(vol_ratio, 2),
-                    "High20d": round(hi20, 4),
-                    "Breakout": last_px >= hi20 * 0.995
-                })
-            except Exception as e:
-                # Never fail the run due to a single ticker
-                log(f"[WARN] ticker {t} skipped: {e}")
-                continue
+        # Unpack {ticker: (close, volume)} once into parallel sequences
+        names, bars = zip(*data.items())
+        closes, vols = zip(*bars)
+        n_days = max(map(len, closes))
+        if n_days < 2:
+            continue
+        close = right_aligned(closes, n_days)
+        vol = right_aligned(vols, n_days)
+
+        mask, last, pct, avg20, tv, ratio, hi20 = filter_kernel(
+            close, vol, MIN_PRICE, MAX_PRICE, float(MIN_AVG_VOL), VOL_RATIO_THRESHOLD, PCT_CHANGE_MIN)
+        sel = np.flatnonzero(mask)
+        if not len(sel):
+            continue
+
+        last, pct, avg20, tv, ratio, hi20 = (x[sel] for x in (last, pct, avg20, tv, ratio, hi20))
+        cols["Ticker"].extend(names[j] for j in sel)
+        cols["LastPrice"].extend(np.round(last, 4).tolist())
+        cols["PctChange"].extend(np.round(pct, 2).tolist())
+        cols["AvgVol20d"].extend(avg20.astype(np.int64).tolist())
+        cols["TodayVol"].extend(tv.astype(np.int64).tolist())
+        cols["VolRatio"].extend(np.round(ratio, 2).tolist())
+        cols["High20d"].extend(np.round(hi20, 4).tolist())
+        cols["Breakout"].extend((last >= hi20 * 0.995).tolist())
 
-    if not results:
-        return pd.DataFrame(columns=["Ticker","LastPrice","PctChange","AvgVol20d","TodayVol","VolRatio","High20d","Breakout"])
+    if not cols["Ticker"]:
+        return pd.DataFrame(columns=SCAN_COLUMNS)
 
-    df = pd.DataFrame(results).sort_values(["VolRatio","PctChange"], ascending=False).reset_index(drop=True)
-    return df
+    # Sort on the two float keys in NumPy, then build the frame once in final order
+    arrays = {k: np.asarray(v) for k, v in cols.items()}
+    order = np.lexsort((-arrays["PctChange"], -arrays["VolRatio"]))
+    return pd.DataFrame({k: v[order] for k, v in arrays.items()})
 
 def main():
     log("[INFO] loading universe...")
     tickers = load_universe(max_symbols=600)
     log(f"[INFO] universe size: {len(tickers)}")
+    tickers = prefilter_by_price(tickers)
+    log(f"[INFO] in price band: {len(tickers)}")
 
     log("[INFO] scanning...")
     scan = scan_universe(tickers)
@@ -203,44 +465,34 @@ def main():
         # Optional news (respects env)
         if NEWS_LOOKBACK_DAYS > 0:
             log("[INFO] adding news flags...")
-            scan["RecentNews48h"] = scan["Ticker"].apply(news_flag)
+            flag = functools.partial(news_flag, cutoff_ts=news_cutoff())
+            with ThreadPoolExecutor(max_workers=NEWS_WORKERS) as ex:
+                scan["RecentNews48h"] = list(ex.map(flag, scan["Ticker"].tolist()))
         else:
             scan["RecentNews48h"] = "No"
 
         # Plan fields
-        def plan_rows(r):
-            px = r["LastPrice"]
-            entry = round(max(MIN_PRICE, px * 0.97), 4)  # ~3% pullback
-            stop  = round(entry * 0.90, 4)               # ~10% risk
-            t1    = round(entry * 1.12, 4)               # +12%
-            t2    = round(entry * 1.25, 4)               # +25%
-            return pd.Series({"Entry":entry, "Stop":stop, "Target1":t1, "Target2":t2})
-
-        scan[["Entry","Stop","Target1","Target2"]] = scan.apply(plan_rows, axis=1)
+        px = scan["LastPrice"].to_numpy(dtype=np.float64)
+        entry = plan_entry(px, MIN_PRICE)
+        scan["Entry"]   = entry
+        scan["Stop"]    = plan_stop(entry)
+        scan["Target1"] = plan_target1(entry)
+        scan["Target2"] = plan_target2(entry)
         cols = ["Ticker","LastPrice","Entry","Stop","Target1","Target2","VolRatio","PctChange","RecentNews48h"]
         scan = scan[cols]
 
         out_csv = f"penny_scan_simple_{datetime.utcnow().date()}.csv"
-        scan.head(TOP_N).to_csv(out_csv, index=False)
+        write_csv(scan.head(TOP_N), out_csv)
         log(f"[INFO] saved: {out_csv}")
 
         if DISCORD_WEBHOOK_URL:
-            msg = format_discord(scan, top_n=min(TOP_N, 10))
-            try:
-                r = requests.post(DISCORD_WEBHOOK_URL, json={"content": msg[:1900]}, timeout=20)
-                log(f"[INFO] discord status: {r.status_code}")
-            except Exception as e:
-                log(f"[WARN] discord post error: {e}")
+            post_discord(format_discord(scan, top_n=min(TOP_N, 10)))
         else:
             log("[INFO] no DISCORD_WEBHOOK_URL set; skipping Discord.")
     else:
         log("[INFO] no candidates found today.")
         if DISCORD_WEBHOOK_URL:
-            try:
-                r = requests.post(DISCORD_WEBHOOK_URL, json={"content": "**Penny Scan Alert**\nNo candidates today."}, timeout=20)
-                log(f"[INFO] discord status: {r.status_code}")
-            except Exception as e:
-                log(f"[WARN] discord post error: {e}")
+            post_discord("**Penny Scan Alert**\nNo candidates today.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file